@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+# export_dashboard.py — exporta o dashboard premium como planilha XLSX.
+#
+# Lê do stdin o mesmo payload de propostas do endpoint
+# GET /api/metrics/premium-dashboard/export.csv ({"proposals": [...]})
+# e grava o workbook no caminho passado como argumento.
+#
+# Uso: cat propostas.json | python scripts/export_dashboard.py Dashboard_Fechou.xlsx
+
+import datetime as dt
+import json
+import os
+import sys
+import zipfile
+from collections import defaultdict
+from functools import lru_cache
+from heapq import nlargest
+from itertools import chain, islice
+from operator import itemgetter
+
+# WolfXL é um substituto API-compatível do openpyxl com serialização em
+# Rust (3-7x no write); usa quando instalado, senão cai para o openpyxl.
+try:
+    from wolfxl import Workbook
+    from wolfxl.cell import WriteOnlyCell
+    from wolfxl.styles import (Alignment, Border, Font, NamedStyle,
+                               PatternFill, Side)
+    from wolfxl.utils import get_column_letter
+except ImportError:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import (Alignment, Border, Font, NamedStyle,
+                                 PatternFill, Side)
+    from openpyxl.utils import get_column_letter
+
+# Parse incremental do stdin quando o ijson está instalado (payloads
+# grandes não ficam duplicados em memória: texto cru + dict parseado).
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+BRAND_DARK = "FF111827"
+BRAND_SLATE = "FF1F2937"
+BRAND_WHITE = "FFFFFFFF"
+BRAND_GRAY = "FFF3F4F6"
+BRAND_GREEN = "FFD1FAE5"
+BRAND_YELLOW = "FFFEF3C7"
+BRAND_RED = "FFFEE2E2"
+
+# Enriquecimentos estáveis por id, no mesmo espírito do motivo_pendencia do
+# export CSV (índice derivado do id para manter o valor determinístico).
+CANAIS = ["Indicação", "Instagram", "Site", "WhatsApp"]
+CATEGORIAS = ["Serviço", "Consultoria", "Projeto", "Manutenção", "Treinamento"]
+UFS = ["SP", "RJ", "MG", "PR", "RS", "BA", "SC", "PE"]
+MOTIVOS = ["Aguardando Assinatura", "Aguardando Pagamento", "Em Revisão"]
+
+DADOS_HEADERS = [
+    "Data", "Cliente", "Título", "Status", "Canal",
+    "Valor", "Categoria", "UF", "Motivo Pendência", "ID",
+]
+
+DASH_ROWS = 56
+DASH_COLS = 20
+KPI_ANCHORS = [(6, 2), (6, 7), (6, 12), (15, 2), (15, 7), (15, 12)]
+
+# Acima deste volume o parse+agregação vai para um Pool de processos em
+# blocos; abaixo dele o overhead de IPC não compensa.
+PARALLEL_MIN = int(os.environ.get("FECHOU_PARALLEL_MIN", 50_000))
+PARALLEL_CHUNK = 10_000
+
+
+@lru_cache(maxsize=16)
+def thin_border(color="FF1F2937"):
+    side = Side(style="thin", color=color)
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+@lru_cache(maxsize=16)
+def solid_fill(color):
+    return PatternFill("solid", fgColor=color)
+
+
+# Estilos openpyxl são imutáveis: construir uma vez e reusar em todas as
+# células evita milhares de alocações idênticas nos loops de linha.
+BORDER_DARK = thin_border()
+BORDER_LIGHT = thin_border("FFE5E7EB")
+ALIGN_LEFT_CENTER = Alignment(horizontal="left", vertical="center")
+ALIGN_CENTER = Alignment(horizontal="center", vertical="center")
+FILL_DARK = solid_fill(BRAND_DARK)
+FILL_SLATE = solid_fill(BRAND_SLATE)
+FILL_WHITE = solid_fill(BRAND_WHITE)
+FILL_GRAY = solid_fill(BRAND_GRAY)
+FILL_GREEN = solid_fill(BRAND_GREEN)
+FILL_YELLOW = solid_fill(BRAND_YELLOW)
+FILL_RED = solid_fill(BRAND_RED)
+STATUS_FILLS = {
+    "vendida": FILL_GREEN,
+    "pendente": FILL_YELLOW,
+    "cancelada": FILL_RED,
+}
+FONT_HEADER = Font(bold=True, color=BRAND_WHITE)
+FONT_SECTION = Font(size=12, bold=True, color=BRAND_SLATE)
+FONT_KPI_TITLE = Font(size=10, color="FF6B7280")
+FONT_KPI_VALUE = Font(size=16, bold=True, color=BRAND_SLATE)
+NF_BRL = '"R$" #,##0.00'
+NF_DATE = "yyyy-mm-dd"
+NF_INT = "0"
+
+
+def register_styles(wb):
+    """Registra os combos recorrentes como NamedStyle.
+
+    Cada combinação distinta de (fonte, fundo, borda, alinhamento) vira
+    uma entrada em styles.xml; nomear as recorrentes garante uma entrada
+    única por combo e reduz a atribuição por célula a uma string.
+    """
+    for style in (
+        NamedStyle(name="hdr", font=FONT_HEADER, fill=FILL_DARK,
+                   border=BORDER_DARK, alignment=ALIGN_CENTER),
+        NamedStyle(name="hdr_secao", font=FONT_HEADER, fill=FILL_SLATE,
+                   border=BORDER_DARK),
+        NamedStyle(name="kpi_titulo", font=FONT_KPI_TITLE, fill=FILL_WHITE,
+                   alignment=ALIGN_LEFT_CENTER),
+        NamedStyle(name="kpi_valor", font=FONT_KPI_VALUE, fill=FILL_WHITE,
+                   alignment=ALIGN_LEFT_CENTER),
+    ):
+        wb.add_named_style(style)
+
+
+_THOUSANDS = str.maketrans("", "", ".")
+
+
+def parse_cents(raw):
+    # Mesma leitura do toNumber() de metrics.routes.ts ("1.234,56"), mas
+    # em centavos inteiros: soma exata e mais barata que float + round.
+    # O sinal sai antes da combinação para ajustes negativos ("-100,50")
+    # não somarem a fração na direção errada.
+    if not raw:
+        return 0
+    s = str(raw).translate(_THOUSANDS).strip()
+    sign = 1
+    if s and s[0] in "+-":
+        sign = -1 if s[0] == "-" else 1
+        s = s[1:]
+    whole, _, frac = s.partition(",")
+    if whole and not whole.isdigit():  # sinal duplicado, lixo etc. -> 0
+        return 0
+    try:
+        return sign * (int(whole or 0) * 100
+                       + (int(frac[:2].ljust(2, "0")) if frac else 0))
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=None)
+def _parse_iso(s):
+    # Exports alinhados a dia repetem muito o mesmo createdAt; o cache
+    # amortiza o parse ISO por string distinta.
+    return dt.datetime.fromisoformat(s.replace("Z", "+00:00")).date()
+
+
+def parse_date(raw):
+    if isinstance(raw, dt.date):
+        return raw
+    try:
+        return _parse_iso(str(raw))
+    except ValueError:
+        return dt.date.today()
+
+
+def last_12_month_keys(today=None):
+    today = today or dt.date.today()
+    keys = []
+    for i in range(11, -1, -1):
+        month = today.month - i
+        year = today.year + (month - 1) // 12
+        month = (month - 1) % 12 + 1
+        keys.append(f"{year:04d}-{month:02d}")
+    return keys
+
+
+def parse_proposal(p):
+    """Converte uma proposta do payload na tupla de linha de Dados."""
+    d = parse_date(p.get("createdAt"))
+    status = p.get("status") or "pendente"
+    pid = int(p.get("id") or 0)
+    return (
+        d,
+        p.get("clientName") or "—",
+        p.get("title") or "—",
+        status,
+        CANAIS[pid % len(CANAIS)],
+        parse_cents(p.get("value")),
+        CATEGORIAS[pid % len(CATEGORIAS)],
+        UFS[pid % len(UFS)],
+        MOTIVOS[pid % len(MOTIVOS)] if status == "pendente" else "N/A",
+        pid,
+        d.strftime("%Y-%m"),
+    )
+
+
+def new_aggregates():
+    return {
+        # bucket mensal: [vendidos, pendentes, canceladas, receita, pendente]
+        # — valores monetários em centavos inteiros
+        "monthly": defaultdict(lambda: [0, 0, 0, 0, 0]),
+        "revenue_by_client": defaultdict(int),
+        "sales_by_client": defaultdict(int),
+        "status_counts": {"vendida": 0, "pendente": 0, "cancelada": 0},
+        "clients": set(),
+        "total_revenue": 0,
+        "pending_value": 0,
+        "max_sale": 0,
+    }
+
+
+def accumulate(agg, r):
+    """Atualiza os agregados com uma linha já parseada.
+
+    Alimentado na mesma passada que constrói rows: totais, série mensal e
+    receita por cliente saem prontos sem varreduras extras, e o Dashboard
+    grava números literais em vez de SUMIFS sobre a base inteira.
+    """
+    client, status, value, meskey = r[1], r[3], r[5], r[10]
+    agg["clients"].add(client)
+    bucket = agg["monthly"][meskey]
+    if status == "vendida":
+        bucket[0] += 1
+        bucket[3] += value
+        agg["total_revenue"] += value
+        agg["revenue_by_client"][client] += value
+        agg["sales_by_client"][client] += 1
+        if value > agg["max_sale"]:
+            agg["max_sale"] = value
+    elif status == "pendente":
+        bucket[1] += 1
+        bucket[4] += value
+        agg["pending_value"] += value
+    elif status == "cancelada":
+        bucket[2] += 1
+    if status in agg["status_counts"]:
+        agg["status_counts"][status] += 1
+
+
+def merge_aggregates(agg, part):
+    for key, bucket in part["monthly"].items():
+        total = agg["monthly"][key]
+        for i, v in enumerate(bucket):
+            total[i] += v
+    for key, v in part["revenue_by_client"].items():
+        agg["revenue_by_client"][key] += v
+    for key, v in part["sales_by_client"].items():
+        agg["sales_by_client"][key] += v
+    for key, v in part["status_counts"].items():
+        agg["status_counts"][key] += v
+    agg["clients"] |= part["clients"]
+    agg["total_revenue"] += part["total_revenue"]
+    agg["pending_value"] += part["pending_value"]
+    agg["max_sale"] = max(agg["max_sale"], part["max_sale"])
+
+
+def _parse_chunk(chunk):
+    """Worker do Pool: parseia um bloco e devolve (linhas, agregados).
+
+    Os defaultdicts viram dicts simples para a volta pelo pickle.
+    """
+    agg = new_aggregates()
+    rows = [parse_proposal(p) for p in chunk]
+    for r in rows:
+        accumulate(agg, r)
+    agg["monthly"] = dict(agg["monthly"])
+    agg["revenue_by_client"] = dict(agg["revenue_by_client"])
+    agg["sales_by_client"] = dict(agg["sales_by_client"])
+    return rows, agg
+
+
+def iter_chunks(iterable, size):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def grid_cell(ws, grid, r, c, value=None, style=None, font=None, fill=None,
+              border=None, number_format=None, alignment=None):
+    """Cria (ou reusa) a WriteOnlyCell na posição 1-based (r, c) da grade."""
+    cell = grid[r - 1][c - 1]
+    if cell is None:
+        cell = WriteOnlyCell(ws)
+        grid[r - 1][c - 1] = cell
+    if value is not None:
+        cell.value = value
+    if style is not None:
+        cell.style = style
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if border is not None:
+        cell.border = border
+    if number_format is not None:
+        cell.number_format = number_format
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def _dashboard_chrome():
+    """Mapa estático (linha, coluna) -> (fundo, borda) do chrome do Dashboard.
+
+    Banner e cascas dos seis cartões de KPI não dependem dos dados, então
+    o layout é calculado uma única vez na importação — o equivalente em
+    memória de copiar um template pronto — e cada export só o aplica.
+    """
+    chrome = {}
+    for r in range(1, 5):
+        for c in range(1, DASH_COLS + 1):
+            chrome[(r, c)] = (FILL_DARK, None)
+    for row, col in KPI_ANCHORS:
+        for r in range(row, row + 7):
+            edge_row = r in (row, row + 6)
+            for c in range(col, col + 4):
+                edge = edge_row or c in (col, col + 3)
+                chrome[(r, c)] = (FILL_WHITE, BORDER_LIGHT if edge else None)
+    return chrome
+
+
+DASH_CHROME = _dashboard_chrome()
+
+
+def merge(ws, r1, c1, r2, c2):
+    ws.merged_cells.add(
+        f"{get_column_letter(c1)}{r1}:{get_column_letter(c2)}{r2}"
+    )
+
+
+def kpi_card(ws, grid, row, col, title, value, number_format):
+    """Preenche título e valor de um cartão cuja casca já veio do chrome."""
+    merge(ws, row + 3, col, row + 4, col + 3)
+    grid_cell(ws, grid, row + 1, col, value=title, style="kpi_titulo")
+    grid_cell(ws, grid, row + 3, col, value=value, style="kpi_valor",
+              number_format=number_format)
+
+
+def trend_row(key, bucket):
+    """Linha da tendência mensal como pares (valor, formato)."""
+    vendidos, pendentes, canceladas, receita, pendente = bucket
+    ticket = round(receita / vendidos) if vendidos else 0
+    return [
+        (key, None),
+        (vendidos, NF_INT),
+        (pendentes, NF_INT),
+        (canceladas, NF_INT),
+        (receita / 100, NF_BRL),
+        (pendente / 100, NF_BRL),
+        (ticket / 100, NF_BRL),
+    ]
+
+
+def styled_dados_row(ws, r, zebra):
+    """Gera uma linha de Dados já estilizada, pronta para um único append."""
+    fill = FILL_GRAY if zebra else FILL_WHITE
+    # O fundo do status é resolvido aqui, na construção da linha: sem
+    # regras de formatação condicional para o Excel reavaliar a cada
+    # recálculo sobre a coluna inteira.
+    status_fill = STATUS_FILLS.get(r[3], fill)
+    row = []
+    # r[10] (meskey) só alimenta os agregados em Python; não vai à folha.
+    for c, value in enumerate(r[:10], start=1):
+        # coluna 6 carrega centavos; só aqui volta para reais
+        cell = WriteOnlyCell(ws, value=value / 100 if c == 6 else value)
+        cell.fill = status_fill if c == 4 else fill
+        cell.alignment = ALIGN_LEFT_CENTER
+        if c == 1:
+            cell.number_format = NF_DATE
+        elif c == 6:
+            cell.number_format = NF_BRL
+        row.append(cell)
+    return row
+
+
+def build_dados(wb, rows):
+    # Dados é a única folha com número de linhas sem limite, então é
+    # construída primeiro e linha a linha: em write_only cada append é
+    # serializado na hora e a memória fica constante em relação à base.
+    ws = wb.create_sheet("Dados")
+
+    widths = [12, 28, 36, 12, 12, 14, 14, 6, 22, 10]
+    for idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+
+    max_row = len(rows) + 1
+
+    header = []
+    for title in DADOS_HEADERS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.style = "hdr"
+        header.append(cell)
+    ws.append(header)
+
+    # Bordas só no cabeçalho: o zebrado já separa as linhas e cada
+    # atributo a menos aqui é O(linhas × colunas) economizado.
+    for i, r in enumerate(rows):
+        ws.append(styled_dados_row(ws, r, i % 2 == 1))
+
+    return max_row
+
+
+def build_dashboard(wb, rows, agg):
+    ws = wb.create_sheet("Dashboard", 0)
+    grid = [[None] * DASH_COLS for _ in range(DASH_ROWS)]
+
+    ws.column_dimensions["A"].width = 3
+    for c in range(2, DASH_COLS):
+        ws.column_dimensions[get_column_letter(c)].width = 11
+    ws.column_dimensions["S"].hidden = True
+    ws.sheet_view.showGridLines = False
+
+    # Chrome estático (banner + cascas dos cartões) pré-calculado
+    for (r, c), (fill, border) in DASH_CHROME.items():
+        grid_cell(ws, grid, r, c, fill=fill, border=border)
+    grid_cell(ws, grid, 2, 2, value="Fechou! — Dashboard Executivo",
+              font=Font(size=18, bold=True, color=BRAND_WHITE))
+    grid_cell(ws, grid, 3, 2,
+              value=f"Gerado em {dt.date.today().isoformat()} · {len(rows)} propostas",
+              font=Font(size=10, color="FF9CA3AF"))
+
+    # Valores dos KPIs (pré-agregados em Python) na coluna oculta S6:S11
+    counts = agg["status_counts"]
+    sold = counts["vendida"]
+    kpis = [
+        (agg["total_revenue"] / 100, NF_BRL),
+        (sold, NF_INT),
+        (counts["pendente"], NF_INT),
+        (agg["pending_value"] / 100, NF_BRL),
+        (round(agg["total_revenue"] / sold) / 100 if sold else 0, NF_BRL),
+        (agg["max_sale"] / 100, NF_BRL),
+    ]
+    for i, (value, _) in enumerate(kpis):
+        grid_cell(ws, grid, 6 + i, 19, value=value)
+
+    titles = ["Receita realizada", "Contratos vendidos", "Pendentes",
+              "Valor pendente", "Ticket médio", "Maior venda"]
+    for i, title in enumerate(titles):
+        row, col = KPI_ANCHORS[i]
+        kpi_card(ws, grid, row, col, title, f"=$S${6 + i}", kpis[i][1])
+
+    # Tendência de 12 meses
+    grid_cell(ws, grid, 23, 2, value="Últimos 12 meses",
+              font=FONT_SECTION)
+    trend_headers = ["Mês", "Vendidos", "Pendentes", "Canceladas",
+                     "Receita", "Valor pendente", "Ticket médio"]
+    for c, title in enumerate(trend_headers, start=2):
+        grid_cell(ws, grid, 24, c, value=title, style="hdr_secao")
+    monthly = agg["monthly"]
+    for i, key in enumerate(last_12_month_keys()):
+        bucket = monthly.get(key) or (0, 0, 0, 0, 0)
+        for c, (value, nf) in enumerate(trend_row(key, bucket), start=2):
+            grid_cell(ws, grid, 25 + i, c, value=value,
+                      border=BORDER_LIGHT, number_format=nf)
+
+    # Distribuição de status
+    grid_cell(ws, grid, 39, 2, value="Status do funil",
+              font=FONT_SECTION)
+    for i, status in enumerate(("vendida", "pendente", "cancelada")):
+        grid_cell(ws, grid, 40 + i, 2, value=status.capitalize(),
+                  border=BORDER_LIGHT)
+        grid_cell(ws, grid, 40 + i, 3, value=counts[status],
+                  border=BORDER_LIGHT, number_format=NF_INT)
+
+    # Top 10 clientes por receita (I44:K53)
+    grid_cell(ws, grid, 42, 9, value="Top 10 clientes",
+              font=FONT_SECTION)
+    for c, title in enumerate(("Cliente", "Vendas", "Receita"), start=9):
+        grid_cell(ws, grid, 43, c, value=title, style="hdr_secao")
+    top10 = nlargest(10, agg["revenue_by_client"].items(), key=itemgetter(1))
+    for i, (name, revenue) in enumerate(top10):
+        r = 44 + i
+        grid_cell(ws, grid, r, 9, value=name, border=BORDER_LIGHT)
+        grid_cell(ws, grid, r, 10, value=agg["sales_by_client"][name],
+                  border=BORDER_LIGHT, number_format=NF_INT)
+        grid_cell(ws, grid, r, 11, value=revenue / 100,
+                  border=BORDER_LIGHT, number_format=NF_BRL)
+
+    for row in grid:
+        ws.append([cell for cell in row])
+
+
+def build_clients(wb, names, max_row):
+    ws = wb.create_sheet("Clientes")
+    ws.column_dimensions["A"].width = 30
+    for col in "BCDEF":
+        ws.column_dimensions[col].width = 14
+
+    # Intervalos limitados à última linha real: referenciar $F:$F faria o
+    # Excel varrer a coluna inteira (1.048.576 linhas) a cada recálculo.
+    data_a = f"Dados!$A$2:$A${max_row}"
+    data_b = f"Dados!$B$2:$B${max_row}"
+    data_d = f"Dados!$D$2:$D${max_row}"
+    data_f = f"Dados!$F$2:$F${max_row}"
+
+    # Templates montados uma única vez; no loop só o número da linha é
+    # interpolado, em vez de remontar a fórmula inteira por cliente.
+    tmpl_receita = f'=SUMIFS({data_f},{data_b},$A{{r}},{data_d},"vendida")'
+    tmpl_vendas = f'=COUNTIFS({data_b},$A{{r}},{data_d},"vendida")'
+    tmpl_pendentes = f'=COUNTIFS({data_b},$A{{r}},{data_d},"pendente")'
+    tmpl_canceladas = f'=COUNTIFS({data_b},$A{{r}},{data_d},"cancelada")'
+    tmpl_ultima = f'=MAXIFS({data_a},{data_b},$A{{r}},{data_d},"vendida")'
+
+    headers = ["Cliente", "Receita", "Vendas", "Pendentes", "Canceladas", "Última venda"]
+    header = []
+    for title in headers:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.style = "hdr"
+        header.append(cell)
+    ws.append(header)
+
+    for i, name in enumerate(names):
+        r = i + 2
+        values = [
+            name,
+            tmpl_receita.format(r=r),
+            tmpl_vendas.format(r=r),
+            tmpl_pendentes.format(r=r),
+            tmpl_canceladas.format(r=r),
+            tmpl_ultima.format(r=r),
+        ]
+        row = []
+        for c, value in enumerate(values, start=1):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = ALIGN_LEFT_CENTER
+            if c == 2:
+                cell.number_format = NF_BRL
+            elif c == 6:
+                cell.number_format = NF_DATE
+            row.append(cell)
+        ws.append(row)
+
+    total_row = len(names) + 2
+    total = WriteOnlyCell(ws, value="Total")
+    total.font = Font(bold=True)
+    total.border = BORDER_DARK
+    total_sum = WriteOnlyCell(ws, value=f"=SUM(B2:B{total_row - 1})")
+    total_sum.font = Font(bold=True)
+    total_sum.border = BORDER_DARK
+    total_sum.number_format = NF_BRL
+    ws.append([total, total_sum])
+
+
+def build_config(wb, rows):
+    ws = wb.create_sheet("Config")
+    ws.column_dimensions["A"].width = 24
+    ws.column_dimensions["B"].width = 30
+    ws.sheet_state = "hidden"
+    for key, value in [
+        ("gerado_em", dt.datetime.now().isoformat(timespec="seconds")),
+        ("total_propostas", len(rows)),
+        ("fonte", "premium-dashboard/export"),
+    ]:
+        ws.append([key, value])
+
+
+def save_workbook(wb, out_path):
+    """Grava o workbook; com FECHOU_FAST=1, usa deflate nível 1.
+
+    A serialização XML domina o custo do save e o deflate padrão (nível
+    6) é CPU-bound; para um dashboard efêmero vale trocar alguns % de
+    tamanho de arquivo por um close bem mais rápido.
+    """
+    # O atalho usa o ExcelWriter do openpyxl, então só vale para workbooks
+    # construídos pelo openpyxl — com o wolfxl ativo, entregar o wb dele ao
+    # writer do openpyxl corromperia o arquivo.
+    if (os.environ.get("FECHOU_FAST")
+            and type(wb).__module__.startswith("openpyxl")):
+        from openpyxl.writer.excel import ExcelWriter
+        archive = zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED,
+                                  compresslevel=1)
+        ExcelWriter(wb, archive).save()
+        return
+    wb.save(out_path)
+
+
+_JSON_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+
+def iter_proposals(stream):
+    """Itera as propostas do stdin sem materializar o payload inteiro."""
+    try:
+        if ijson is not None:
+            yield from ijson.items(stream, "proposals.item")
+        else:
+            yield from (json.load(stream) or {}).get("proposals") or []
+    except _JSON_ERRORS:  # stdin vazio ou truncado: exporta planilha vazia
+        return
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("uso: export_dashboard.py <saida.xlsx>", file=sys.stderr)
+        return 1
+
+    # Uma única passada constrói as linhas e alimenta os agregados; depois
+    # disso só restam o sort e o append por linha. Acima de PARALLEL_MIN
+    # propostas, os blocos de parse são distribuídos por processos.
+    rows = []
+    agg = new_aggregates()
+    proposals = iter_proposals(sys.stdin.buffer)
+    head = list(islice(proposals, PARALLEL_MIN))
+    if len(head) < PARALLEL_MIN:
+        for p in head:
+            r = parse_proposal(p)
+            rows.append(r)
+            accumulate(agg, r)
+    else:
+        from multiprocessing import Pool
+        with Pool() as pool:
+            chunks = iter_chunks(chain(head, proposals), PARALLEL_CHUNK)
+            # imap (ordenado) mantém a ordem de submissão: o sort final é
+            # só por data, então a ordem relativa dentro do mesmo dia deve
+            # vir do payload, como no caminho serial.
+            for chunk_rows, part in pool.imap(_parse_chunk, chunks):
+                rows.extend(chunk_rows)
+                merge_aggregates(agg, part)
+    rows.sort(key=itemgetter(0))
+
+    # write_only: sem grade de células em memória; cada append vira XML direto.
+    wb = Workbook(write_only=True)
+    register_styles(wb)
+    max_row = build_dados(wb, rows)
+    build_dashboard(wb, rows, agg)
+    # Clientes continua em SUMIFS para permanecer vivo se Dados for editada.
+    build_clients(wb, sorted(agg["clients"]), max_row)
+    build_config(wb, rows)
+    save_workbook(wb, sys.argv[1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())